@@ -147,10 +147,10 @@ def main():
             print(f"❌ Erro no processamento dos dados: {e}")
             return
 
-        # Remove hora, mantendo apenas a data
+        # Mantém as datas como datetime64 (a hora é removida só no recorte exportado)
         try:
-            recibos['DATA PGTO'] = pd.to_datetime(recibos['DATA PGTO']).dt.date
-            recibos['DATA ENCERRAMENTO'] = pd.to_datetime(recibos['DATA ENCERRAMENTO']).dt.date
+            recibos['DATA PGTO'] = pd.to_datetime(recibos['DATA PGTO'], errors='coerce', cache=True)
+            recibos['DATA ENCERRAMENTO'] = pd.to_datetime(recibos['DATA ENCERRAMENTO'], errors='coerce', cache=True)
         except Exception as e:
             logger.warning(f"Erro ao converter datas: {e}")
 
@@ -172,11 +172,14 @@ def main():
 
         # Filtra pelo período desejado baseado em DATA PGTO
         try:
-            valid = recibos.dropna(subset=['DATA PGTO']).copy()
-            valid['MES'] = valid['DATA PGTO'].astype(str).str.slice(0, 7)
+            # Máscara calculada uma única vez (datas nulas nunca pertencem ao período)
+            no_periodo = recibos['DATA PGTO'].dt.to_period('M') == pd.Period(periodo, freq='M')
             
-            if periodo in valid['MES'].unique():
-                df_periodo = valid[valid['MES'] == periodo].drop(columns='MES')
+            if no_periodo.any():
+                df_periodo = recibos[no_periodo].copy()
+                # Remove hora, mantendo apenas a data
+                df_periodo['DATA PGTO'] = df_periodo['DATA PGTO'].dt.date
+                df_periodo['DATA ENCERRAMENTO'] = df_periodo['DATA ENCERRAMENTO'].dt.date
                 logger.info(f"Encontrados {len(df_periodo)} registros para o período {periodo}")
                 
                 # Exporta para Excel
@@ -1,13 +1,57 @@
 import os
 import pandas as pd
 from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment, PatternFill, Font, Border, Side
+from openpyxl.styles import Alignment, PatternFill, Font, Border, Side, NamedStyle
+from openpyxl.styles.borders import DEFAULT_BORDER
 from style_config import (
     CONTABEIS_COLS, CURRENCY_FORMATS, DATE_FORMATS, THEMES, 
     DECIMAL_SEPARATORS, COLUMN_WIDTHS, BORDER_STYLES, BORDER_CONFIGS
 )
 
 
+def _build_border(style, color: str):
+    """
+    Monta uma borda com o mesmo estilo e cor nos quatro lados.
+    Retorna None quando o estilo é None (sem borda).
+    """
+    if not style:
+        return None
+    side = Side(style=style, color=color)
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+def _build_styles(theme_cfg: dict, border_cfg: dict, currency_format: str) -> dict:
+    """
+    Monta uma única vez os objetos de estilo compartilhados por todas as
+    planilhas de uma exportação.
+
+    Args:
+        theme_cfg: Configuração de cores do tema
+        border_cfg: Configuração de bordas
+        currency_format: Formato numérico das colunas contábeis
+
+    Returns:
+        dict: Estilos do cabeçalho e atributos do estilo contábil
+    """
+    border_color = border_cfg['border_color']
+    header_border = _build_border(BORDER_STYLES.get(border_cfg['header_border']), border_color)
+    data_border = _build_border(BORDER_STYLES.get(border_cfg['data_border']), border_color)
+
+    return {
+        'header_fill': PatternFill(start_color=theme_cfg['header_bg'], end_color=theme_cfg['header_bg'], fill_type='solid'),
+        'header_font': Font(color=theme_cfg['header_font'], bold=True),
+        'header_alignment': Alignment(horizontal='center'),
+        'header_border': header_border,
+        'contabil': {
+            'number_format': currency_format,
+            'alignment': Alignment(horizontal='left'),
+            'fill': PatternFill(start_color=theme_cfg['contabil_bg'], end_color=theme_cfg['contabil_bg'], fill_type='solid'),
+            'font': Font(color=theme_cfg['contabil_font']),
+            'border': data_border or DEFAULT_BORDER,
+        },
+    }
+
+
 def export_to_excel(
     dataframes_by_month: dict,
     output_dir: str,
@@ -30,6 +74,7 @@ def export_to_excel(
     theme_cfg = THEMES.get(theme, THEMES['default'])
     border_cfg = BORDER_CONFIGS.get(border_theme, BORDER_CONFIGS['default'])
     decimal_sep = decimal_separator or DECIMAL_SEPARATORS.get(language, ',')
+    styles = _build_styles(theme_cfg, border_cfg, currency_format)
 
     for month, df in dataframes_by_month.items():
         filepath = os.path.join(output_dir, f"Recebimentos_{month}.xlsx")
@@ -38,14 +83,10 @@ def export_to_excel(
             df.to_excel(writer, sheet_name=sheet_name, index=False)
             ws = writer.sheets[sheet_name]
 
-            # Estilo de cabeçalho
-            header_fill = PatternFill(start_color=theme_cfg['header_bg'], end_color=theme_cfg['header_bg'], fill_type='solid')
-            header_font = Font(color=theme_cfg['header_font'], bold=True)
-
-            # Configurar bordas
-            border_color = border_cfg['border_color']
-            header_border_style = BORDER_STYLES.get(border_cfg['header_border'])
-            data_border_style = BORDER_STYLES.get(border_cfg['data_border'])
+            # Estilo das células contábeis registrado uma vez no workbook;
+            # cada célula recebe apenas a referência ao estilo nomeado
+            contabil_style = NamedStyle(name='Recebimentos Contábil', **styles['contabil'])
+            writer.book.add_named_style(contabil_style)
 
             for idx, col in enumerate(df.columns, start=1):
                 # Ajusta largura da coluna usando configuração personalizada
@@ -54,35 +95,18 @@ def export_to_excel(
 
                 # Aplica formatação contábil para colunas numéricas
                 if col in CONTABEIS_COLS:
-                    for row_idx, cell in enumerate(ws[get_column_letter(idx)][1:], start=2):
-                        cell.number_format = currency_format
-                        cell.alignment = Alignment(horizontal='left')
-                        cell.fill = PatternFill(start_color=theme_cfg['contabil_bg'], end_color=theme_cfg['contabil_bg'], fill_type='solid')
-                        cell.font = Font(color=theme_cfg['contabil_font'])
-                        
-                        # Aplica bordas aos dados
-                        if data_border_style:
-                            cell.border = Border(
-                                left=Side(style=data_border_style, color=border_color),
-                                right=Side(style=data_border_style, color=border_color),
-                                top=Side(style=data_border_style, color=border_color),
-                                bottom=Side(style=data_border_style, color=border_color)
-                            )
+                    for cell in ws[get_column_letter(idx)][1:]:
+                        cell.style = contabil_style.name
 
                 # Aplica estilo ao cabeçalho
                 header_cell = ws[f"{get_column_letter(idx)}1"]
-                header_cell.fill = header_fill
-                header_cell.font = header_font
-                header_cell.alignment = Alignment(horizontal='center')
+                header_cell.fill = styles['header_fill']
+                header_cell.font = styles['header_font']
+                header_cell.alignment = styles['header_alignment']
                 
                 # Aplica bordas ao cabeçalho
-                if header_border_style:
-                    header_cell.border = Border(
-                        left=Side(style=header_border_style, color=border_color),
-                        right=Side(style=header_border_style, color=border_color),
-                        top=Side(style=header_border_style, color=border_color),
-                        bottom=Side(style=header_border_style, color=border_color)
-                    )
+                if styles['header_border']:
+                    header_cell.border = styles['header_border']
 
             # Ajusta separador decimal se necessário (apenas visual, não altera valores)
             # (Excel usa o separador do sistema, mas podemos ajustar o formato se necessário)
@@ -145,9 +145,11 @@ def get_contas(conn) -> pd.DataFrame:
         
         # Log de estatísticas básicas
         if not df.empty:
+            # Contagem por situação em uma única passada
+            situacao = df['PAGO'].value_counts()
             logging.info(f"   Referências únicas: {df['REFERENCIA'].nunique()}")
-            logging.info(f"   Registros pagos: {len(df[df['PAGO'] == 'S'])}")
-            logging.info(f"   Registros pendentes: {len(df[df['PAGO'] == 'N'])}")
+            logging.info(f"   Registros pagos: {situacao.get('S', 0)}")
+            logging.info(f"   Registros pendentes: {situacao.get('N', 0)}")
             logging.info(f"   Valor total: {df['VALOR'].sum():.2f}")
         
         return df
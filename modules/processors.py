@@ -1,8 +1,14 @@
+import re
 import pandas as pd
 import logging
 from typing import Optional, Tuple
 
 
+# Padrões compilados uma única vez na importação do módulo
+_REFERENCIA_OS_RE = re.compile(r'^O(\d+)$')  # Referência de OS: O<número>
+_DIGITOS_RE = re.compile(r'(\d+)')  # Primeiro grupo numérico (COD_CONTA)
+
+
 def _prepara_ordens(ordens_df: pd.DataFrame) -> pd.DataFrame:
     """
     Prepara e processa dados da tabela ORDEMS.
@@ -14,25 +20,19 @@ def _prepara_ordens(ordens_df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame processado com colunas renomeadas
     """
     logging.info("📋 Processando tabela ORDEMS...")
-    ordens = ordens_df.copy()
-    
-    # Calcula VALOR TOTAL conforme especificação
-    ordens['VALOR TOTAL'] = ordens[['V_MAO', 'V_PECAS', 'V_DESLOCA', 'V_TERCEIRO', 'V_OUTROS']].sum(axis=1)
     
-    # Cria VEÍCULO (PLACA) conforme especificação
-    ordens['VEÍCULO (PLACA)'] = ordens['APARELHO'].astype(str) + ' (' + ordens['MODELO'].astype(str) + ')'
-    
-    # Renomeia colunas conforme especificação
-    ordens_proc = ordens.rename(columns={
-        'CODIGO': 'N° OS',
-        'SAIDA': 'DATA ENCERRAMENTO',
-        'V_MAO': 'VALOR MÃO DE OBRA',
-        'V_PECAS': 'VALOR PEÇAS',
-        'V_OUTROS': 'DESCONTO'
-    })[[
-        'N° OS', 'DATA ENCERRAMENTO', 'VALOR TOTAL',
-        'VALOR MÃO DE OBRA', 'VALOR PEÇAS', 'DESCONTO', 'VEÍCULO (PLACA)'
-    ]]
+    # Monta o resultado direto das colunas usadas, sem copiar a tabela inteira
+    ordens_proc = pd.DataFrame({
+        'N° OS': ordens_df['CODIGO'],
+        'DATA ENCERRAMENTO': ordens_df['SAIDA'],
+        # Calcula VALOR TOTAL conforme especificação
+        'VALOR TOTAL': ordens_df[['V_MAO', 'V_PECAS', 'V_DESLOCA', 'V_TERCEIRO', 'V_OUTROS']].sum(axis=1),
+        'VALOR MÃO DE OBRA': ordens_df['V_MAO'],
+        'VALOR PEÇAS': ordens_df['V_PECAS'],
+        'DESCONTO': ordens_df['V_OUTROS'],
+        # Cria VEÍCULO (PLACA) conforme especificação
+        'VEÍCULO (PLACA)': ordens_df['APARELHO'].astype(str) + ' (' + ordens_df['MODELO'].astype(str) + ')'
+    })
     
     logging.info(f"✅ ORDEMS processada: {len(ordens_proc)} registros")
     return ordens_proc
@@ -49,108 +49,134 @@ def _extrai_receitas(fcaixa_df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
         Tuple[pd.Series, pd.Series]: (pix_receita, dinheiro_receita)
     """
     logging.info("💰 Processando tabela FCAIXA...")
-    fcaixa = fcaixa_df.copy()
     
-    # Extrai código numérico da coluna COD_CONTA
-    fcaixa['COD_CONTA_NUM'] = (
-        fcaixa['COD_CONTA']
-        .astype(str)
-        .str.extract(r'(\d+)', expand=False)
-        .fillna('0')
-        .astype(int)
-    )
+    # Apenas PIX (FORMA=0) e Dinheiro (FORMA=5) entram no cálculo; filtra
+    # antes de extrair o código para não rodar a regex nas demais linhas
+    fcaixa = fcaixa_df[fcaixa_df['FORMA'].isin([0, 5])].copy()
     
-    # Calcula receitas por forma de pagamento
-    pix_receita = fcaixa[fcaixa['FORMA'] == 0].groupby('COD_CONTA_NUM')['RECEITA'].sum()
-    dinheiro_receita = fcaixa[fcaixa['FORMA'] == 5].groupby('COD_CONTA_NUM')['RECEITA'].sum()
+    # Extrai código numérico da coluna COD_CONTA; quando a coluna já vem
+    # inteira do banco, dispensa a conversão para texto e a regex
+    if pd.api.types.is_integer_dtype(fcaixa['COD_CONTA']):
+        fcaixa['COD_CONTA_NUM'] = fcaixa['COD_CONTA'].astype(int)
+    else:
+        fcaixa['COD_CONTA_NUM'] = (
+            fcaixa['COD_CONTA']
+            .astype(str)
+            .str.extract(_DIGITOS_RE, expand=False)
+            .fillna('0')
+            .astype(int)
+        )
     
-    logging.info(f"✅ FCAIXA processada: {len(fcaixa)} registros")
+    # Calcula receitas por forma de pagamento em uma única agregação
+    receitas = fcaixa.groupby(['FORMA', 'COD_CONTA_NUM'])['RECEITA'].sum()
+    formas = receitas.index.get_level_values('FORMA')
+    pix_receita = receitas[formas == 0].droplevel('FORMA')
+    dinheiro_receita = receitas[formas == 5].droplevel('FORMA')
+    
+    logging.info(f"✅ FCAIXA processada: {len(fcaixa_df)} registros")
     logging.info(f"   Receitas PIX (FORMA=0): {len(pix_receita)} registros")
     logging.info(f"   Receitas Dinheiro (FORMA=5): {len(dinheiro_receita)} registros")
     
     return pix_receita, dinheiro_receita
 
 
-def _valida_referencia_os(referencia: str) -> bool:
+def _prepara_contas(contas_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Valida se a referência está no formato correto para OS.
+    Prepara a tabela CONTAS uma única vez para os cálculos de contas pagas
+    e devidas: converte CODIGO e extrai o número da OS da referência.
     
     Args:
-        referencia: String da referência
+        contas_df: DataFrame da tabela CONTAS
         
     Returns:
-        bool: True se estiver no formato O\d+
+        pd.DataFrame: Contas com referência de OS válida e coluna OS numérica
     """
-    import re
-    return bool(re.match(r'^O\d+$', str(referencia)))
+    logging.info("📑 Preparando tabela CONTAS...")
+    
+    # Extrai número da OS da referência (formato O\d+); referências fora
+    # do formato ficam nulas, o que dispensa uma validação linha a linha.
+    # Cada OS costuma ter várias parcelas com a mesma referência, então a
+    # regex roda uma vez por referência distinta e o resultado é espalhado
+    codigos_ref, referencias = pd.factorize(contas_df['REFERENCIA'].astype(str), use_na_sentinel=False)
+    os_por_referencia = pd.Series(referencias).str.extract(_REFERENCIA_OS_RE, expand=False)
+    os_ref = pd.Series(os_por_referencia.to_numpy()[codigos_ref], index=contas_df.index)
+    validas = os_ref.notna()
+    
+    # Log de referências inválidas
+    refs_invalidas = contas_df.loc[~validas, 'REFERENCIA'].unique()
+    if len(refs_invalidas) > 0:
+        logging.warning(f"   Referências inválidas encontradas: {refs_invalidas[:10]}...")
+    
+    # Copia só as linhas com OS válida, em vez da tabela inteira
+    contas = contas_df[validas].copy()
+    contas['OS'] = os_ref[validas].astype(int)
+    
+    # Converte CODIGO para numérico
+    contas['CODIGO'] = pd.to_numeric(contas['CODIGO'], errors='coerce').fillna(0).astype(int)
+    
+    logging.info(f"✅ CONTAS preparada: {len(contas)} registros com OS válida")
+    return contas
 
 
 def _processa_contas_pagas(
-    contas_df: pd.DataFrame, 
+    contas: pd.DataFrame, 
     periodo: Optional[str],
-    pix_receita: pd.Series,
-    dinheiro_receita: pd.Series
+    fcaixa_df: pd.DataFrame
 ) -> pd.DataFrame:
     """
     Processa contas pagas (PAGO = 'S') e calcula formas de pagamento.
     
+    As receitas do FCAIXA só são extraídas quando existem contas pagas
+    no período.
+    
     Args:
-        contas_df: DataFrame da tabela CONTAS
+        contas: Tabela CONTAS já preparada por _prepara_contas
         periodo: Período para filtrar (YYYY-MM)
-        pix_receita: Series com receitas PIX
-        dinheiro_receita: Series com receitas Dinheiro
+        fcaixa_df: DataFrame da tabela FCAIXA
         
     Returns:
         pd.DataFrame: DataFrame agregado por OS
     """
     logging.info("💳 Processando tabela CONTAS (pagas)...")
-    contas_pagas = contas_df.copy()
-    
-    # Converte CODIGO para numérico
-    contas_pagas['CODIGO'] = pd.to_numeric(contas_pagas['CODIGO'], errors='coerce').fillna(0).astype(int)
-    
-    # Valida e extrai número da OS da referência
-    contas_pagas['REFERENCIA_VALIDA'] = contas_pagas['REFERENCIA'].apply(_valida_referencia_os)
-    contas_pagas['OS'] = contas_pagas['REFERENCIA'].astype(str).str.extract(r'^O(\d+)$', expand=False)
-    
-    # Log de referências inválidas
-    refs_invalidas = contas_pagas[~contas_pagas['REFERENCIA_VALIDA']]['REFERENCIA'].unique()
-    if len(refs_invalidas) > 0:
-        logging.warning(f"   Referências inválidas encontradas: {refs_invalidas[:10]}...")
-    
-    contas_pagas = contas_pagas.dropna(subset=['OS']).copy()
-    contas_pagas['OS'] = contas_pagas['OS'].astype(int)
     
     # Filtra apenas contas pagas (PAGO = 'S')
-    contas_pagas = contas_pagas[contas_pagas['PAGO'] == 'S'].copy()
+    contas_pagas = contas[contas['PAGO'] == 'S'].copy()
+    
+    # Converte DATA_PGTO uma única vez; cache=True reaproveita a conversão
+    # de datas repetidas (vários pagamentos no mesmo dia)
+    contas_pagas['DATA_PGTO'] = pd.to_datetime(contas_pagas['DATA_PGTO'], errors='coerce', cache=True)
     
     # Filtra por DATA_PGTO do período especificado
     if periodo:
-        contas_pagas['DATA_PGTO'] = pd.to_datetime(contas_pagas['DATA_PGTO'], errors='coerce')
-        contas_pagas['MES_PGTO'] = contas_pagas['DATA_PGTO'].dt.strftime('%Y-%m')
-        contas_pagas = contas_pagas[contas_pagas['MES_PGTO'] == periodo].copy()
-        contas_pagas = contas_pagas.drop(columns=['MES_PGTO'])
+        # Compara o mês como período (inteiro), sem formatar uma string por linha
+        mes_pgto = contas_pagas['DATA_PGTO'].dt.to_period('M')
+        contas_pagas = contas_pagas[mes_pgto == pd.Period(periodo, freq='M')].copy()
         logging.info(f"   Filtrado para período: {periodo}")
     
-    # Merge com receitas do FCAIXA para cálculos de DINHEIRO e PIX
-    contas_pagas = contas_pagas.merge(
-        pix_receita.rename('RECEITA_PIX'),
-        left_on='CODIGO', right_index=True, how='left'
-    )
-    contas_pagas = contas_pagas.merge(
-        dinheiro_receita.rename('RECEITA_DINHEIRO'),
-        left_on='CODIGO', right_index=True, how='left'
-    )
-    contas_pagas = contas_pagas.fillna(0)
-    
-    # Calcula DINHEIRO e PIX conforme especificação CORRETA
-    # DINHEIRO = ECF_DINHEIRO - RECEITA (FORMA = 5)
-    # PIX = ECF_DINHEIRO - RECEITA (FORMA = 0)
-    contas_pagas['DINHEIRO'] = contas_pagas['ECF_DINHEIRO'] - contas_pagas['RECEITA_DINHEIRO']
-    contas_pagas['PIX'] = contas_pagas['ECF_DINHEIRO'] - contas_pagas['RECEITA_PIX']
+    if contas_pagas.empty:
+        # Sem contas pagas não há o que cruzar com o FCAIXA
+        logging.info("   Nenhuma conta paga encontrada; FCAIXA não será processada")
+        contas_pagas['DINHEIRO'] = 0.0
+        contas_pagas['PIX'] = 0.0
+    else:
+        pix_receita, dinheiro_receita = _extrai_receitas(fcaixa_df)
+        
+        # Preenche nulos com 0, preservando DATA_PGTO já convertida
+        colunas_valores = contas_pagas.columns.drop('DATA_PGTO')
+        contas_pagas[colunas_valores] = contas_pagas[colunas_valores].fillna(0)
+        
+        # Busca as receitas do FCAIXA direto no índice (COD_CONTA_NUM),
+        # sem merges que copiam o DataFrame inteiro
+        receita_pix = contas_pagas['CODIGO'].map(pix_receita).fillna(0)
+        receita_dinheiro = contas_pagas['CODIGO'].map(dinheiro_receita).fillna(0)
+        
+        # Calcula DINHEIRO e PIX conforme especificação CORRETA
+        # DINHEIRO = ECF_DINHEIRO - RECEITA (FORMA = 5)
+        # PIX = ECF_DINHEIRO - RECEITA (FORMA = 0)
+        contas_pagas['DINHEIRO'] = contas_pagas['ECF_DINHEIRO'] - receita_dinheiro
+        contas_pagas['PIX'] = contas_pagas['ECF_DINHEIRO'] - receita_pix
     
-    # Garante que DATA_PGTO seja datetime e agrega por OS
-    contas_pagas['DATA_PGTO'] = pd.to_datetime(contas_pagas['DATA_PGTO'], errors='coerce')
+    # Agrega por OS
     agg_pagas = contas_pagas.groupby('OS').agg({
         'COD_CLIENTE': 'first',
         'VALOR': 'sum',
@@ -171,30 +197,20 @@ def _processa_contas_pagas(
     return agg_pagas
 
 
-def _processa_contas_devidas(contas_df: pd.DataFrame) -> pd.Series:
+def _processa_contas_devidas(contas: pd.DataFrame) -> pd.Series:
     """
     Processa contas devidas (PAGO = 'N') para cálculo do DEVEDOR.
     
     Args:
-        contas_df: DataFrame da tabela CONTAS
+        contas: Tabela CONTAS já preparada por _prepara_contas
         
     Returns:
         pd.Series: Series com valores devidos por OS
     """
     logging.info("💸 Processando tabela CONTAS (devidas)...")
-    contas_devidas = contas_df.copy()
-    
-    # Converte CODIGO para numérico
-    contas_devidas['CODIGO'] = pd.to_numeric(contas_devidas['CODIGO'], errors='coerce').fillna(0).astype(int)
-    
-    # Valida e extrai número da OS da referência
-    contas_devidas['REFERENCIA_VALIDA'] = contas_devidas['REFERENCIA'].apply(_valida_referencia_os)
-    contas_devidas['OS'] = contas_devidas['REFERENCIA'].astype(str).str.extract(r'^O(\d+)$', expand=False)
-    contas_devidas = contas_devidas.dropna(subset=['OS']).copy()
-    contas_devidas['OS'] = contas_devidas['OS'].astype(int)
     
     # Filtra apenas contas devidas (PAGO = 'N')
-    contas_devidas = contas_devidas[contas_devidas['PAGO'] == 'N'].copy()
+    contas_devidas = contas[contas['PAGO'] == 'N']
     
     # Agrega DEVEDOR por OS
     agg_devidas = contas_devidas.groupby('OS')['VALOR'].sum().rename('DEVEDOR')
@@ -242,27 +258,25 @@ def process_recebimentos(
         # Prepara ordens
         ordens_proc = _prepara_ordens(ordens_df)
         
-        # Extrai receitas
-        pix_receita, dinheiro_receita = _extrai_receitas(fcaixa_df)
+        # Prepara CONTAS uma única vez para pagas e devidas
+        contas = _prepara_contas(contas_df)
         
-        # Processa contas pagas
-        agg_pagas = _processa_contas_pagas(contas_df, periodo, pix_receita, dinheiro_receita)
+        # Processa contas pagas (extrai as receitas do FCAIXA quando necessário)
+        agg_pagas = _processa_contas_pagas(contas, periodo, fcaixa_df)
         
         # Processa contas devidas
-        agg_devidas = _processa_contas_devidas(contas_df)
+        agg_devidas = _processa_contas_devidas(contas)
         
-        # Merge final com as ordens
+        # Merge final com as ordens: pagas e devidas já estão indexadas por OS,
+        # então são alinhadas entre si e cruzadas com as ordens em um único merge
         logging.info("🔗 Fazendo merge final...")
-        final = ordens_proc.merge(agg_pagas, left_on='N° OS', right_index=True, how='left')
-        final = final.merge(agg_devidas, left_on='N° OS', right_index=True, how='left')
+        pagamentos = agg_pagas.join(agg_devidas, how='outer')
+        final = ordens_proc.merge(pagamentos, left_on='N° OS', right_index=True, how='left')
         
-        # Preenche valores nulos com 0
-        final['DEVEDOR'] = final['DEVEDOR'].fillna(0)
-        final['VALOR PAGO'] = final['VALOR PAGO'].fillna(0)
-        final['CARTÃO'] = final['CARTÃO'].fillna(0)
-        final['DINHEIRO'] = final['DINHEIRO'].fillna(0)
-        final['PIX'] = final['PIX'].fillna(0)
-        final['TROCO'] = final['TROCO'].fillna(0)
+        # Preenche valores nulos com 0 apenas nas colunas de pagamento,
+        # numa única chamada em vez de uma atribuição por coluna
+        colunas_pagamento = ['DEVEDOR', 'VALOR PAGO', 'CARTÃO', 'DINHEIRO', 'PIX', 'TROCO']
+        final = final.fillna({col: 0 for col in colunas_pagamento})
         
         # Reordena colunas conforme especificação
         colunas_finais = [
@@ -179,6 +179,24 @@ class TestExcelExport:
             assert header_cell.border.top.color.rgb[2:] == expected_color, "Cor da borda superior incorreta"
             assert header_cell.border.bottom.color.rgb[2:] == expected_color, "Cor da borda inferior incorreta"
     
+    def test_data_border_styling(self, sample_data, output_dir):
+        """Testa se as bordas das células contábeis seguem o tema de bordas"""
+        for theme in ['corporate', 'minimal']:
+            export_to_excel(sample_data, output_dir, border_theme=theme)
+
+            file_path = os.path.join(output_dir, "Recebimentos_2024-01.xlsx")
+            wb = load_workbook(file_path)
+            ws = wb["2024-01"]
+
+            contabil_cell = ws['C3']  # VALOR TOTAL, segunda linha de dados
+            border_config = BORDER_CONFIGS[theme]
+
+            if border_config['data_border'] == 'none':
+                assert contabil_cell.border.left.style is None, f"Borda de dados aplicada indevidamente para tema {theme}"
+            else:
+                assert contabil_cell.border.left.style == border_config['data_border'], f"Borda de dados incorreta para tema {theme}"
+                assert contabil_cell.border.bottom.color.rgb[2:] == border_config['border_color'], f"Cor da borda de dados incorreta para tema {theme}"
+
     def test_multiple_border_themes(self, sample_data, output_dir):
         """Testa diferentes temas de bordas"""
         themes_to_test = ['default', 'corporate', 'dark', 'minimal']
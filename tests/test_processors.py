@@ -0,0 +1,88 @@
+import pytest
+import pandas as pd
+from modules.processors import process_recebimentos
+
+
+class TestProcessRecebimentos:
+    """Testes para o processamento da tabela consolidada de recebimentos"""
+
+    @pytest.fixture
+    def ordens_df(self):
+        """Dados de exemplo da tabela ORDEMS"""
+        return pd.DataFrame({
+            'CODIGO': [1, 2, 3],
+            'COD_CLIENTE': [10, 20, 30],
+            'SAIDA': pd.to_datetime(['2024-01-10', '2024-01-12', '2024-02-01']),
+            'V_MAO': [100.0, 200.0, 300.0],
+            'V_PECAS': [50.0, 0.0, 10.0],
+            'V_DESLOCA': [0.0, 0.0, 0.0],
+            'V_TERCEIRO': [0.0, 0.0, 0.0],
+            'V_OUTROS': [-10.0, 0.0, 0.0],
+            'APARELHO': ['GOL', 'UNO', 'CIVIC'],
+            'MODELO': ['ABC1234', 'XYZ5678', 'DEF9012']
+        })
+
+    @pytest.fixture
+    def contas_df(self):
+        """Dados de exemplo da tabela CONTAS"""
+        return pd.DataFrame({
+            'CODIGO': ['1', '2', '3', '4', '5'],
+            'REFERENCIA': ['O1', 'O1', 'O2', 'X99', 'O3'],
+            'VALOR': [70.0, 70.0, 200.0, 999.0, 310.0],
+            'PAGO': ['S', 'S', 'S', 'S', 'N'],
+            'DATA_PGTO': pd.to_datetime(['2024-01-10', '2024-01-15', '2024-01-12', '2024-01-12', None]),
+            'COD_CLIENTE': [10, 10, 20, 99, 30],
+            'ECF_CARTAO': [0.0, 70.0, 0.0, 0.0, 0.0],
+            'ECF_DINHEIRO': [70.0, 0.0, 200.0, 999.0, 0.0],
+            'ECF_TROCO': [0.0, 0.0, 5.0, 0.0, 0.0]
+        })
+
+    @pytest.fixture
+    def fcaixa_df(self):
+        """Dados de exemplo da tabela FCAIXA"""
+        return pd.DataFrame({
+            'CODIGO': [1, 2, 3],
+            'DIA': pd.to_datetime(['2024-01-10', '2024-01-12', '2024-01-12']),
+            'RECEITA': [70.0, 150.0, 50.0],
+            'COD_CONTA': ['C1', 'C3', 'C3'],
+            'FORMA': [5, 0, 5]
+        })
+
+    def test_consolidated_columns(self, ordens_df, contas_df, fcaixa_df):
+        """Testa se a tabela consolidada tem uma linha por OS e as colunas esperadas"""
+        final = process_recebimentos(ordens_df, contas_df, fcaixa_df, '2024-01')
+
+        assert list(final['N° OS']) == [1, 2, 3], "Ordens de serviço incorretas"
+        assert 'VALOR PAGO' in final.columns, "Coluna VALOR PAGO não encontrada"
+        assert 'DATA PGTO' in final.columns, "Coluna DATA PGTO não encontrada"
+
+    def test_payment_values(self, ordens_df, contas_df, fcaixa_df):
+        """Testa os valores agregados por OS"""
+        final = process_recebimentos(ordens_df, contas_df, fcaixa_df, '2024-01').set_index('N° OS')
+
+        assert final.loc[1, 'VALOR PAGO'] == 140.0, "VALOR PAGO da OS 1 incorreto"
+        assert final.loc[1, 'CARTÃO'] == 70.0, "CARTÃO da OS 1 incorreto"
+        assert final.loc[2, 'PIX'] == 50.0, "PIX da OS 2 incorreto"
+        assert final.loc[2, 'DINHEIRO'] == 150.0, "DINHEIRO da OS 2 incorreto"
+        assert final.loc[3, 'DEVEDOR'] == 310.0, "DEVEDOR da OS 3 incorreto"
+
+    def test_invalid_references_ignored(self, ordens_df, contas_df, fcaixa_df):
+        """Testa se referências fora do formato O<número> são ignoradas"""
+        final = process_recebimentos(ordens_df, contas_df, fcaixa_df, '2024-01')
+
+        assert final['VALOR PAGO'].sum() == 340.0, "Referência inválida foi considerada"
+
+    def test_period_filter(self, ordens_df, contas_df, fcaixa_df):
+        """Testa se apenas pagamentos do período informado são considerados"""
+        final = process_recebimentos(ordens_df, contas_df, fcaixa_df, '2024-02')
+
+        assert final['VALOR PAGO'].sum() == 0, "Pagamentos fora do período foram considerados"
+        assert final['DEVEDOR'].sum() == 310.0, "DEVEDOR não deve depender do período"
+
+    def test_empty_contas(self, ordens_df, contas_df, fcaixa_df):
+        """Testa processamento com tabelas CONTAS e FCAIXA vazias"""
+        final = process_recebimentos(ordens_df, contas_df.iloc[0:0], fcaixa_df.iloc[0:0], '2024-01')
+
+        assert len(final) == len(ordens_df), "Ordens não foram preservadas"
+        assert final['VALOR PAGO'].sum() == 0, "VALOR PAGO deveria ser zero"
+        assert final['DEVEDOR'].sum() == 0, "DEVEDOR deveria ser zero"